@@ -1,38 +1,174 @@
 import logging
-from homeassistant.core import HomeAssistant
+import os
+import time
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.config_entries import ConfigEntry, ConfigEntryNotReady
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
 import homeassistant.helpers.config_validation as cv
-from .const import DOMAIN
-from pymbrewclient import BreweryClient
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.service import async_register_admin_service
+from .const import (
+    CAPTURE_FILENAME,
+    CONF_CAPTURE_OVERVIEWS,
+    CONF_SENSOR_KINDS,
+    DOMAIN,
+    PROFILE_FILENAME,
+    SENSOR_KINDS,
+    SERVICE_PROFILE,
+    SERVICE_REPLAY_CAPTURE,
+)
+from .api import MiniBrewClient, is_auth_error
+from .capture import OverviewRecorder, async_get_capture_key, async_replay_capture
+from .coordinator import MiniBrewDataUpdateCoordinator
+from .curves import async_backfill_from_recorder
+from .executor import ClientExecutor
+from .profiling import RefreshProfiler, profiler_in_use
+from .websocket import async_register_websocket_commands
 
 
 _LOGGER = logging.getLogger(__name__)
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
+REPLAY_CAPTURE_SCHEMA = vol.Schema({
+    vol.Required("config_entry_id"): cv.string,
+    vol.Required("file"): cv.string,
+    vol.Optional("speed", default=0.0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+})
+
+PROFILE_SCHEMA = vol.Schema({
+    vol.Required("config_entry_id"): cv.string,
+    vol.Optional("cycles", default=5): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+    vol.Optional("memory", default=False): cv.boolean,
+})
+
+def _get_coordinator(hass: HomeAssistant, entry_id: str) -> MiniBrewDataUpdateCoordinator:
+    """Return the coordinator of a loaded config entry."""
+    coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
+    if coordinator is None:
+        raise HomeAssistantError(f"MiniBrew entry {entry_id} is not loaded")
+    return coordinator
+
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the Minibrew integration."""
     _LOGGER.debug("Setting up Minibrew integration")
+
+    async def async_handle_replay_capture(call: ServiceCall) -> None:
+        """Replay a capture file through a separate coordinator for a config entry."""
+        coordinator = _get_coordinator(hass, call.data["config_entry_id"])
+        config_dir = os.path.realpath(hass.config.config_dir)
+        path = os.path.realpath(hass.config.path(call.data["file"]))
+        if os.path.commonpath([config_dir, path]) != config_dir:
+            raise HomeAssistantError(f"Capture files must be inside the configuration directory: {call.data['file']}")
+        try:
+            await async_replay_capture(hass, coordinator.config_entry, path, call.data["speed"])
+        except OSError as err:
+            raise HomeAssistantError(f"Could not read capture file {path}: {err}") from err
+
+    async def async_handle_profile(call: ServiceCall) -> None:
+        """Profile the next refresh cycles of a config entry."""
+        coordinator = _get_coordinator(hass, call.data["config_entry_id"])
+        others = [other for other in hass.data.get(DOMAIN, {}).values() if other is not coordinator]
+        if profiler_in_use() or any(other.profiler is not None for other in others):
+            raise HomeAssistantError("Another profiler is already running, wait for it to finish")
+        path_prefix = hass.config.path(
+            PROFILE_FILENAME.format(entry_id=coordinator.config_entry.entry_id, timestamp=int(time.time()))
+        )
+        coordinator.async_start_profile(RefreshProfiler(call.data["cycles"], call.data["memory"], path_prefix))
+        _LOGGER.info("Profiling the next %s MiniBrew refresh cycle(s)", call.data["cycles"])
+
+    async_register_admin_service(
+        hass, DOMAIN, SERVICE_REPLAY_CAPTURE, async_handle_replay_capture, schema=REPLAY_CAPTURE_SCHEMA
+    )
+    async_register_admin_service(hass, DOMAIN, SERVICE_PROFILE, async_handle_profile, schema=PROFILE_SCHEMA)
+    async_register_websocket_commands(hass)
     return True
 
+def _async_remove_untracked_devices(hass: HomeAssistant, config_entry: ConfigEntry, tracked: set) -> None:
+    """Detach registry devices that the tracked devices option no longer selects."""
+    if not tracked:
+        return
+    device_registry = dr.async_get(hass)
+    for device in dr.async_entries_for_config_entry(device_registry, config_entry.entry_id):
+        serial_numbers = {identifier for domain, identifier in device.identifiers if domain == DOMAIN}
+        if serial_numbers and not serial_numbers & tracked:
+            _LOGGER.debug("Removing untracked MiniBrew device %s", device.name)
+            device_registry.async_update_device(device.id, remove_config_entry_id=config_entry.entry_id)
+
+def _async_remove_deselected_sensors(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Remove registry sensors whose kind the sensor kinds option no longer selects."""
+    selected = set(config_entry.options.get(CONF_SENSOR_KINDS, SENSOR_KINDS))
+    entity_registry = er.async_get(hass)
+    for entity in er.async_entries_for_config_entry(entity_registry, config_entry.entry_id):
+        # The translation key of every MiniBrew sensor is its kind
+        if entity.domain == "sensor" and entity.translation_key in SENSOR_KINDS and entity.translation_key not in selected:
+            _LOGGER.debug("Removing deselected MiniBrew sensor %s", entity.entity_id)
+            entity_registry.async_remove(entity.entity_id)
+
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Set up Minibrew from a config entry."""
     minibrew_username = config_entry.data["username"]
     minibrew_password = config_entry.data["password"]
 
+    # Log in on the entry's own executor so a slow or hung login never blocks
+    # the event loop or the setup of other entries.
+    executor = ClientExecutor(config_entry.entry_id)
     try:
-        minibrew_client = BreweryClient(username=minibrew_username, password=minibrew_password)
-        _LOGGER.debug(f"Minibrew initialized")
-        hass.data.setdefault(DOMAIN, {})
-        hass.data[DOMAIN][config_entry.entry_id] = minibrew_client
+        minibrew_client = await executor.async_call(MiniBrewClient.login, minibrew_username, minibrew_password)
+        _LOGGER.debug("Minibrew initialized")
     except Exception as ex:
-        _LOGGER.error("Could not connect to Minibrew: %s", ex)
-        raise ConfigEntryNotReady from ex
+        executor.shutdown()
+        if is_auth_error(ex):
+            raise ConfigEntryAuthFailed(f"MiniBrew rejected the credentials: {ex}") from ex
+        _LOGGER.debug("Could not connect to Minibrew: %s", ex)
+        raise ConfigEntryNotReady(f"Could not connect to MiniBrew: {ex}") from ex
+
+    recorder = None
+    if config_entry.options.get(CONF_CAPTURE_OVERVIEWS, False):
+        recorder = OverviewRecorder(
+            hass.config.path(CAPTURE_FILENAME.format(entry_id=config_entry.entry_id)),
+            await async_get_capture_key(hass, config_entry.entry_id),
+        )
+        _LOGGER.info("Capturing MiniBrew overview responses to %s", recorder.path)
+
+    coordinator = MiniBrewDataUpdateCoordinator(
+        hass, minibrew_client, config_entry, executor, recorder=recorder
+    )
+    await coordinator.async_load_stage_trackers()
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except (ConfigEntryNotReady, ConfigEntryAuthFailed):
+        await coordinator.async_shutdown()
+        raise
+
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][config_entry.entry_id] = coordinator
+    _async_remove_untracked_devices(hass, config_entry, coordinator.tracked_devices)
+    _async_remove_deselected_sensors(hass, config_entry)
+    config_entry.async_on_unload(config_entry.add_update_listener(async_reload_entry))
+    config_entry.async_create_background_task(
+        hass,
+        async_backfill_from_recorder(hass, coordinator.curves, coordinator.device_index),
+        f"{DOMAIN}_curve_backfill_{config_entry.entry_id}",
+    )
 
     await hass.config_entries.async_forward_entry_setups(config_entry, ["sensor"])
     return True
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    coordinator = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if coordinator is not None and coordinator.options == dict(entry.options):
+        # Only the credentials changed, reauthentication already applied them in place
+        return
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor"])
-    return unload_ok
\ No newline at end of file
+    if unload_ok:
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if coordinator is not None:
+            await coordinator.async_shutdown()
+    return unload_ok
@@ -0,0 +1,76 @@
+"""MiniBrew cloud client used by the integration."""
+import requests
+from pymbrewclient import BreweryClient
+from pymbrewclient.rest import client as rest_client
+
+from .const import CLIENT_REQUEST_TIMEOUT
+
+OVERVIEW_ENDPOINT = "v1/breweryoverview"
+# Only Unauthorized means rejected credentials, Forbidden can be a lapsed subscription
+AUTH_ERROR_STATUS = {401}
+
+
+class _TimeoutRequests:
+    """The requests module as seen by pymbrewclient, with a default socket timeout.
+
+    pymbrewclient sends its requests without a timeout, so a hung connection
+    would hold an executor worker forever. Drop this once pymbrewclient
+    accepts a timeout itself.
+    """
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+    @staticmethod
+    def get(url, **kwargs):
+        kwargs.setdefault("timeout", CLIENT_REQUEST_TIMEOUT)
+        return requests.get(url, **kwargs)
+
+    @staticmethod
+    def post(url, **kwargs):
+        kwargs.setdefault("timeout", CLIENT_REQUEST_TIMEOUT)
+        return requests.post(url, **kwargs)
+
+
+rest_client.requests = _TimeoutRequests()
+
+
+def is_auth_error(err: Exception) -> bool:
+    """Return True if an exception from the client means the credentials were rejected."""
+    response = getattr(err, "response", None)
+    return getattr(response, "status_code", None) in AUTH_ERROR_STATUS
+
+
+class MiniBrewClient(BreweryClient):
+    """BreweryClient that can return the undecoded brewery overview."""
+
+    def __init__(self, username: str, password: str):
+        """Initialize the client and keep the credentials for a fresh login."""
+        super().__init__(username=username, password=password)
+        self._username = username
+        self._password = password
+
+    @classmethod
+    def login(cls, username: str, password: str) -> "MiniBrewClient":
+        """Create a client and authenticate it. Blocking, run it in an executor."""
+        client = cls(username=username, password=password)
+        client.get_token()
+        return client
+
+    def set_credentials(self, username: str, password: str) -> None:
+        """Swap the credentials in place and drop the current token."""
+        self._username = username
+        self._password = password
+        self.drop_token()
+
+    def drop_token(self) -> None:
+        """Forget the current token so the next request logs in again."""
+        super().__init__(username=self._username, password=self._password)
+
+    def get_brewery_overview_payload(self) -> dict:
+        """Fetch the brewery overview as the raw JSON payload.
+
+        Decoding is left to the coordinator so one malformed device does not
+        fail the whole overview.
+        """
+        return self.client.get(OVERVIEW_ENDPOINT).json()
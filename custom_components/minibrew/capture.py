@@ -0,0 +1,217 @@
+"""Record and replay of MiniBrew brewery overview responses."""
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import time
+
+from homeassistant.helpers.storage import Store
+
+from .const import CAPTURE_KEY_STORAGE_KEY, CAPTURE_KEY_STORAGE_VERSION
+from .coordinator import MiniBrewDataUpdateCoordinator
+from .executor import ClientExecutor
+from .helpers import _device_to_dict
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fields that identify the account or its devices. They are replaced by a
+# stable pseudonym so a replayed device keeps the same identity across records.
+REDACTED_KEYS = {"uuid", "serial_number", "title", "sub_title", "image"}
+
+
+async def async_get_capture_key(hass, entry_id: str) -> bytes:
+    """Return the secret pseudonym key of an entry, creating it on first use.
+
+    The key never leaves Home Assistant, so pseudonyms in a shared capture
+    cannot be reversed by hashing candidate serial numbers.
+    """
+    store = Store(hass, CAPTURE_KEY_STORAGE_VERSION, CAPTURE_KEY_STORAGE_KEY.format(entry_id=entry_id))
+    stored = await store.async_load()
+    if stored is None:
+        stored = {"key": secrets.token_hex(32)}
+        await store.async_save(stored)
+    return bytes.fromhex(stored["key"])
+
+
+def _pseudonymize(value, key: bytes):
+    """Return a stable, non-reversible stand-in for an identifying value."""
+    if value is None:
+        return None
+    digest = hmac.new(key, str(value).encode("utf-8"), hashlib.sha256).hexdigest()
+    return f"redacted-{digest[:12]}"
+
+
+def _redact_device(device, key: bytes):
+    """Redact one device record, leaving records that are not objects untouched."""
+    if not isinstance(device, dict) and not hasattr(device, "__dict__"):
+        return device
+    return {
+        field: _pseudonymize(value, key) if field in REDACTED_KEYS else value
+        for field, value in _device_to_dict(device).items()
+    }
+
+
+def redact_overview(overview, key: bytes):
+    """Return a JSON-serializable, redacted copy of a raw or decoded brewery overview."""
+    groups = overview if isinstance(overview, dict) else overview.__dict__
+    redacted = {}
+    for group_name, devices in groups.items():
+        if isinstance(devices, list):
+            redacted[group_name] = [_redact_device(device, key) for device in devices]
+        else:
+            redacted[group_name] = devices
+    return redacted
+
+
+class OverviewRecorder:
+    """Append redacted overview responses to a JSON lines capture file."""
+
+    def __init__(self, path: str, key: bytes):
+        """Initialize the recorder."""
+        self.path = path
+        self.records = 0
+        self._key = key
+
+    def record(self, overview, timestamp: float | None = None):
+        """Append one overview to the capture file. Runs in the executor."""
+        line = json.dumps(
+            {
+                "ts": time.time() if timestamp is None else timestamp,
+                "overview": redact_overview(overview, self._key),
+            },
+            separators=(",", ":"),
+        )
+        with open(self.path, "a", encoding="utf-8") as capture_file:
+            capture_file.write(line + "\n")
+        self.records += 1
+
+
+def _validate_record(record):
+    """Raise ValueError unless a decoded capture line is a usable record."""
+    if not isinstance(record, dict):
+        raise ValueError("not an object")
+    if not isinstance(record.get("ts"), (int, float)):
+        raise ValueError("missing or non-numeric ts")
+    if not isinstance(record.get("overview"), dict):
+        raise ValueError("missing overview object")
+
+
+def load_capture(path: str) -> list[dict]:
+    """Load all records from a capture file. Runs in the executor."""
+    records = []
+    with open(path, encoding="utf-8") as capture_file:
+        for line_number, line in enumerate(capture_file, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                _validate_record(record)
+            except ValueError as err:
+                _LOGGER.warning("Skipping malformed capture record on line %s of %s: %s", line_number, path, err)
+                continue
+            records.append(record)
+    return records
+
+
+class ReplayExhausted(Exception):
+    """Raised when a replay client has no captured responses left."""
+
+
+class ReplayClient:
+    """Stand-in for MiniBrewClient that serves captured overview payloads."""
+
+    def __init__(self, records: list[dict]):
+        """Initialize the replay client."""
+        self._records = list(records)
+        self._position = 0
+
+    @property
+    def remaining(self) -> int:
+        """Return the number of captured responses not yet served."""
+        return len(self._records) - self._position
+
+    def get_brewery_overview_payload(self) -> dict:
+        """Return the next captured overview payload."""
+        if self._position >= len(self._records):
+            raise ReplayExhausted("No captured overview responses left to replay")
+        record = self._records[self._position]
+        self._position += 1
+        return record["overview"]
+
+
+class ReplayCoordinator(MiniBrewDataUpdateCoordinator):
+    """Coordinator that runs captured overviews through the pipeline in isolation.
+
+    It has no listeners, never polls and never captures. Side effects that
+    would reach the live entry (stored stage trackers, repair issues, bus
+    events and the curve cache) are skipped; events are only counted.
+    """
+
+    def __init__(self, hass, config_entry, records: list[dict]):
+        """Initialize the replay coordinator."""
+        super().__init__(
+            hass,
+            ReplayClient(records),
+            config_entry,
+            ClientExecutor(f"{config_entry.entry_id}_replay"),
+        )
+        self.update_interval = None
+        # Captured serial numbers are pseudonyms, the tracked devices option cannot match them
+        self.tracked_devices = set()
+        self.events = 0
+
+    def _async_create_quarantine_issue(self, key, err):
+        """Do not raise repair issues for replayed records."""
+
+    def _async_delete_quarantine_issue(self, key):
+        """Do not touch repair issues for replayed records."""
+
+    def _async_save_stage_trackers(self):
+        """Keep replayed stage trackers in memory only."""
+
+    async def _async_flush_stage_trackers(self):
+        """Keep replayed stage trackers in memory only."""
+
+    def _async_record_curves(self):
+        """Keep replayed readings out of the curve cache."""
+
+    def _async_fire_event(self, event_type, event_data):
+        """Count the event instead of firing it."""
+        self.events += 1
+
+
+async def async_replay_capture(hass, config_entry, path: str, speed: float = 0.0):
+    """Feed a capture file through a separate coordinator for a config entry.
+
+    A speed of 1.0 replays at the captured pace, higher values accelerate it
+    and 0 replays every record back to back. The entry's live coordinator,
+    entities and devices are not touched.
+    """
+    records = await hass.async_add_executor_job(load_capture, path)
+    coordinator = ReplayCoordinator(hass, config_entry, records)
+
+    started = time.monotonic()
+    previous_ts = None
+    try:
+        for record in records:
+            if speed > 0 and previous_ts is not None:
+                await asyncio.sleep(max(0.0, (record["ts"] - previous_ts) / speed))
+            previous_ts = record["ts"]
+            await coordinator.async_refresh()
+    finally:
+        await coordinator.async_shutdown()
+
+    elapsed = time.monotonic() - started
+    _LOGGER.info(
+        "Replayed %s captured overview(s) from %s in %.3fs: %s device(s), %s event(s), %s decode failure(s)",
+        len(records),
+        path,
+        elapsed,
+        len(coordinator.device_index),
+        coordinator.events,
+        coordinator.decode_failures,
+    )
+    return len(records), elapsed
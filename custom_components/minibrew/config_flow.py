@@ -1,12 +1,27 @@
 import logging
+import requests
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.selector import SelectSelector, SelectSelectorConfig
 from dataclasses import asdict
 
-from .const import DOMAIN
-from pymbrewclient import BreweryClient, Device
+from .const import (
+    CONF_CAPTURE_OVERVIEWS,
+    CONF_DEBUG_DUMP_EVERY,
+    CONF_REFRESH_INTERVAL,
+    CONF_SENSOR_KINDS,
+    CONF_TRACKED_DEVICES,
+    DEFAULT_DEBUG_DUMP_EVERY,
+    DEFAULT_REFRESH_INTERVAL,
+    DOMAIN,
+    SENSOR_KINDS,
+)
+from .api import MiniBrewClient, is_auth_error
+from .executor import ClientCallTimeout, ClientExecutor
+from .helpers import decode_overview
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,6 +30,19 @@ CONFIG_SCHEMA = vol.Schema({
     vol.Required("password"): str,
 })
 
+def _fetch_brewery_overview(username: str, password: str):
+    """Log in and fetch the brewery overview. Blocking, run it in an executor."""
+    overview, _ = decode_overview(MiniBrewClient.login(username, password).get_brewery_overview_payload())
+    return overview
+
+async def _async_fetch_brewery_overview(flow_id: str, username: str, password: str):
+    """Fetch the brewery overview on a short-lived client executor with a deadline."""
+    executor = ClientExecutor(f"flow_{flow_id}", max_workers=1, max_in_flight=1)
+    try:
+        return await executor.async_call(_fetch_brewery_overview, username, password)
+    finally:
+        executor.shutdown()
+
 class PymbrewClientConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for PymbrewClient."""
 
@@ -32,10 +60,12 @@ class PymbrewClientConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         username = user_input["username"]
         password = user_input["password"]
         try:
-            # Initialize the client and fetch the brewery overview
-            client = BreweryClient(username, password)
-            brewery_overview = await self.hass.async_add_executor_job(client.get_brewery_overview)
-            _LOGGER.debug(f"Brewery overview: {brewery_overview}")
+            # Initialize the client and fetch the brewery overview off the event loop
+            brewery_overview = await _async_fetch_brewery_overview(self.flow_id, username, password)
+            _LOGGER.debug(
+                "Brewery overview: %s",
+                {group: len(devices) for group, devices in brewery_overview.__dict__.items()},
+            )
 
             # make sure we have some devices
             if not brewery_overview:
@@ -49,12 +79,57 @@ class PymbrewClientConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     },
                 )
 
-        except ConnectionError:
-            return self._show_user_form(errors={"base": "cannot_connect"})
         except Exception as err:
+            if is_auth_error(err):
+                return self._show_user_form(errors={"base": "invalid_auth"})
+            if isinstance(err, (ConnectionError, ClientCallTimeout, requests.RequestException)):
+                return self._show_user_form(errors={"base": "cannot_connect"})
             _LOGGER.error("Unexpected error: %s", err)
             return self._show_user_form(errors={"base": "unknown_error"})
 
+    async def async_step_reauth(self, entry_data):
+        """Handle reauthentication when MiniBrew rejects the stored credentials."""
+        self._reauth_entry = self.hass.config_entries.async_get_entry(self.context["entry_id"])
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(self, user_input=None):
+        """Ask for new credentials and apply them to the running entry."""
+        entry = self._reauth_entry
+        errors = {}
+        if user_input is not None:
+            username = user_input["username"]
+            password = user_input["password"]
+            try:
+                await _async_fetch_brewery_overview(self.flow_id, username, password)
+            except Exception as err:
+                if is_auth_error(err):
+                    errors["base"] = "invalid_auth"
+                elif isinstance(err, (ConnectionError, ClientCallTimeout, requests.RequestException)):
+                    errors["base"] = "cannot_connect"
+                else:
+                    _LOGGER.error("Unexpected error: %s", err)
+                    errors["base"] = "unknown_error"
+            else:
+                self.hass.config_entries.async_update_entry(
+                    entry, data={**entry.data, "username": username, "password": password}
+                )
+                coordinator = self.hass.data.get(DOMAIN, {}).get(entry.entry_id)
+                if coordinator is not None:
+                    # Keep the entities and coordinator, just swap the credentials
+                    self.hass.async_create_task(coordinator.async_update_credentials(username, password))
+                else:
+                    self.hass.async_create_task(self.hass.config_entries.async_reload(entry.entry_id))
+                return self.async_abort(reason="reauth_successful")
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema({
+                vol.Required("username", default=entry.data["username"]): str,
+                vol.Required("password"): str,
+            }),
+            errors=errors,
+        )
+
 
     def _show_user_form(self, errors=None) -> FlowResult:
         """Show the user form for manual configuration."""
@@ -84,9 +159,35 @@ class PymbrewClientOptionsFlowHandler(config_entries.OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
 
+        options = self.config_entry.options
+        tracked_devices = options.get(CONF_TRACKED_DEVICES, [])
+        # Offer every device in the last overview, plus any tracked device that is offline
+        coordinator = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        devices = dict(coordinator.known_devices) if coordinator is not None else {}
+        for serial_number in tracked_devices:
+            devices.setdefault(serial_number, serial_number)
+
         # Default value from existing options or fallback to 60
         options_schema = vol.Schema({
-            vol.Optional("refresh_interval", default=self.config_entry.options.get("refresh_interval", 60)): int,
+            vol.Optional(
+                CONF_REFRESH_INTERVAL,
+                default=self.config_entry.options.get(CONF_REFRESH_INTERVAL, DEFAULT_REFRESH_INTERVAL),
+            ): int,
+            vol.Optional(
+                CONF_CAPTURE_OVERVIEWS,
+                default=self.config_entry.options.get(CONF_CAPTURE_OVERVIEWS, False),
+            ): bool,
+            vol.Optional(
+                CONF_DEBUG_DUMP_EVERY,
+                default=self.config_entry.options.get(CONF_DEBUG_DUMP_EVERY, DEFAULT_DEBUG_DUMP_EVERY),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional(CONF_TRACKED_DEVICES, default=tracked_devices): cv.multi_select(devices),
+            vol.Optional(
+                CONF_SENSOR_KINDS,
+                default=options.get(CONF_SENSOR_KINDS, SENSOR_KINDS),
+            ): SelectSelector(
+                SelectSelectorConfig(options=SENSOR_KINDS, multiple=True, translation_key=CONF_SENSOR_KINDS)
+            ),
         })
 
         return self.async_show_form(
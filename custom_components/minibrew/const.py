@@ -1,2 +1,71 @@
 DOMAIN = "minibrew"
-MANUFACTURER = "MiniBrew"
\ No newline at end of file
+MANUFACTURER = "MiniBrew"
+
+CONF_REFRESH_INTERVAL = "refresh_interval"
+CONF_CAPTURE_OVERVIEWS = "capture_overviews"
+
+DEFAULT_REFRESH_INTERVAL = 60
+# Polling backs off up to this many seconds while reauthentication is pending
+REAUTH_MAX_INTERVAL = 3600
+
+CAPTURE_FILENAME = "minibrew_capture_{entry_id}.jsonl"
+CAPTURE_KEY_STORAGE_VERSION = 1
+CAPTURE_KEY_STORAGE_KEY = "minibrew.{entry_id}.capture_key"
+
+SERVICE_REPLAY_CAPTURE = "replay_capture"
+
+EVENT_GROUP_CHANGED = "minibrew_group_changed"
+EVENT_STAGE_CHANGED = "minibrew_stage_changed"
+EVENT_USER_ACTION_RAISED = "minibrew_user_action_raised"
+EVENT_USER_ACTION_CLEARED = "minibrew_user_action_cleared"
+EVENT_CLEANING_NEEDED = "minibrew_cleaning_needed"
+EVENT_CLEANED = "minibrew_cleaned"
+EVENT_DEVICE_ONLINE = "minibrew_device_online"
+EVENT_DEVICE_OFFLINE = "minibrew_device_offline"
+
+# Blocking pymbrewclient calls run on a small per-entry executor
+CLIENT_MAX_WORKERS = 2
+# Calls beyond the workers wait in the executor queue until one is free
+CLIENT_MAX_IN_FLIGHT = 4
+CLIENT_CALL_TIMEOUT = 30
+# Socket timeout of each HTTP request, so a hung connection frees its worker
+CLIENT_REQUEST_TIMEOUT = 10
+
+STAGE_STORAGE_VERSION = 1
+STAGE_STORAGE_KEY = "minibrew.{entry_id}.stages"
+# Stage trackers are saved on every transition and at least this often in seconds
+STAGE_SAVE_INTERVAL = 300
+# Longest gap between two refreshes credited to a stage, in refresh intervals
+STAGE_MAX_GAP_INTERVALS = 3
+
+CONF_DEBUG_DUMP_EVERY = "debug_dump_every"
+DEFAULT_DEBUG_DUMP_EVERY = 0
+# Consecutive failed refreshes between repeated warnings
+FAILURE_LOG_EVERY = 10
+
+SERVICE_PROFILE = "profile"
+PROFILE_FILENAME = "minibrew_profile_{entry_id}_{timestamp}"
+
+CONF_TRACKED_DEVICES = "tracked_devices"
+CONF_SENSOR_KINDS = "sensor_kinds"
+
+# Sensor kinds, keyed by translation key, that can be selected in the options
+SENSOR_KINDS = [
+    "current_temperature",
+    "temperature",
+    "target_temperature",
+    "brew_stage",
+    "current_stage",
+    "time_in_stage",
+    "beer_name",
+    "beer_style",
+    "user_action_required",
+    "cloud_connection",
+    "update_status",
+    "needs_cleaning",
+]
+
+# Temperature curve cache: readings kept per device and recorder backfill on setup
+CURVE_MAX_POINTS = 40320
+CURVE_BACKFILL_DAYS = 14
+WS_TEMPERATURE_CURVE = "minibrew/temperature_curve"
@@ -0,0 +1,431 @@
+import logging
+import time
+from contextlib import nullcontext
+from datetime import timedelta
+
+from homeassistant.components import persistent_notification
+from homeassistant.config_entries import SOURCE_REAUTH
+from homeassistant.core import callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .api import is_auth_error
+from .const import (
+    CONF_DEBUG_DUMP_EVERY,
+    CONF_REFRESH_INTERVAL,
+    CONF_TRACKED_DEVICES,
+    DEFAULT_DEBUG_DUMP_EVERY,
+    DEFAULT_REFRESH_INTERVAL,
+    DOMAIN,
+    FAILURE_LOG_EVERY,
+    REAUTH_MAX_INTERVAL,
+    STAGE_MAX_GAP_INTERVALS,
+    STAGE_SAVE_INTERVAL,
+    STAGE_STORAGE_KEY,
+    STAGE_STORAGE_VERSION,
+)
+from .curves import TemperatureCurveCache
+from .events import diff_snapshots, snapshot_overview
+from .executor import ClientBusy, ClientCallTimeout
+from .helpers import DeviceDecodeError, IndexedDevice, _device_to_dict, decode_overview, filter_payload
+from .stages import StageTracker
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _no_phase(name, paused=False):
+    """Stand-in for RefreshProfiler.phase when no profile is running."""
+    return nullcontext()
+
+
+class MiniBrewDataUpdateCoordinator(DataUpdateCoordinator):
+    """Class to manage fetching MiniBrew data from the API."""
+
+    def __init__(self, hass, client, config_entry, executor, recorder=None):
+        """Initialize the coordinator."""
+        self.client = client
+        self.config_entry = config_entry
+        self.recorder = recorder
+        self.snapshot = {}
+        self.executor = executor
+        # serial number, "group:position" for unidentified records or group -> quarantine details
+        self.quarantined = {}
+        self.decode_failures = 0
+        # serial number -> IndexedDevice for the latest overview
+        self.device_index = {}
+        # serial number -> StageTracker for Craft devices
+        self.stage_trackers = {}
+        # Recent current/target temperature per device for the temperature_curve websocket command
+        self.curves = TemperatureCurveCache()
+        self.debug_dump_every = config_entry.options.get(CONF_DEBUG_DUMP_EVERY, DEFAULT_DEBUG_DUMP_EVERY)
+        self.refresh_count = 0
+        self.failure_streak = 0
+        self.last_refresh_stats = {}
+        # Options the entry was set up with, to tell option changes from credential updates
+        self.options = dict(config_entry.options)
+        # Serial numbers to index and diff, empty means every device
+        self.tracked_devices = set(config_entry.options.get(CONF_TRACKED_DEVICES, []))
+        # serial number -> title of every device in the last overview, tracked or not
+        self.known_devices = {}
+        self.reauth_pending = False
+        self._interval_before_reauth = None
+        # RefreshProfiler while a minibrew.profile run is active
+        self.profiler = None
+        self._stage_store = Store(
+            hass, STAGE_STORAGE_VERSION, STAGE_STORAGE_KEY.format(entry_id=config_entry.entry_id)
+        )
+        self._stage_saved_at = None
+        refresh_interval = config_entry.options.get(CONF_REFRESH_INTERVAL, DEFAULT_REFRESH_INTERVAL)
+        # Longest refresh gap credited to a stage, so downtime is not counted as brewing
+        self._stage_max_gap = refresh_interval * STAGE_MAX_GAP_INTERVALS
+        super().__init__(
+            hass,
+            _LOGGER,
+            name="MiniBrew Data Update Coordinator",
+            update_interval=timedelta(seconds=refresh_interval),  # Fetch data every 30 seconds
+        )
+        self.client = client
+
+    async def _async_update_data(self):
+        """Fetch data from the API, profiling the cycle while a profile run is active."""
+        profiler = self.profiler
+        if profiler is None:
+            return await self._async_refresh_cycle(_no_phase)
+
+        profiler.begin_cycle()
+        try:
+            return await self._async_refresh_cycle(profiler.phase)
+        except BaseException:
+            # Listeners are skipped after a failed refresh, so stop profiling here
+            profiler.cancel_cycle()
+            raise
+        finally:
+            if profiler.interrupted:
+                _LOGGER.warning("Another profiler became active, stopping the MiniBrew profile run")
+                profiler.abort()
+                if self.profiler is profiler:
+                    self.profiler = None
+
+    async def _async_refresh_cycle(self, phase):
+        """Fetch, decode and index one brewery overview."""
+        started = time.monotonic()
+        try:
+            _LOGGER.debug("Fetching data from MiniBrew API...")
+            with phase("fetch", paused=True):
+                payload = await self._async_fetch_payload()
+        except (ClientCallTimeout, ClientBusy) as err:
+            self._log_failure("Skipping MiniBrew refresh: %s (%s)", err, self.executor.as_dict())
+            raise UpdateFailed(str(err)) from err
+        except Exception as err:
+            if is_auth_error(err):
+                return self._async_handle_auth_failure(err)
+            self._log_failure("Error fetching data: %s", err)
+            raise UpdateFailed(f"Error fetching data: {err}")
+        fetched = time.monotonic()
+        if self.reauth_pending:
+            self._async_resume_after_reauth()
+
+        self.refresh_count += 1
+        self.failure_streak = 0
+        if (
+            self.debug_dump_every
+            and self.refresh_count % self.debug_dump_every == 0
+            and _LOGGER.isEnabledFor(logging.DEBUG)
+        ):
+            _LOGGER.debug("Sampled overview payload (refresh %s): %s", self.refresh_count, payload)
+
+        if self.recorder is not None:
+            with phase("capture", paused=True):
+                await self._async_capture(payload)
+
+        try:
+            with phase("decode"):
+                payload, self.known_devices = filter_payload(payload, self.tracked_devices)
+                data, failures = decode_overview(payload)
+        except DeviceDecodeError as err:
+            raise UpdateFailed(f"Unexpected brewery overview payload: {err}") from err
+        previous_index = self.device_index
+        with phase("index"):
+            self._async_quarantine(data, failures)
+            self._async_update_index(data)
+            self._async_update_stage_trackers()
+            self._async_record_curves()
+
+        try:
+            with phase("events"):
+                self._async_fire_transition_events(data)
+        except Exception:  # Events must never fail the refresh
+            _LOGGER.exception("Error detecting MiniBrew device transitions")
+
+        self.last_refresh_stats = {
+            "devices": len(self.device_index),
+            "groups": {group_name: len(devices) for group_name, devices in data.__dict__.items()},
+            "quarantined": len(self.quarantined),
+            "fetch_seconds": round(fetched - started, 3),
+            "process_seconds": round(time.monotonic() - fetched, 3),
+        }
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            changed = [
+                serial_number
+                for serial_number, indexed in self.device_index.items()
+                if serial_number not in previous_index
+                or previous_index[serial_number].attributes != indexed.attributes
+            ]
+            _LOGGER.debug("MiniBrew refresh %s: %s, changed=%s", self.refresh_count, self.last_refresh_stats, changed)
+        return data
+
+    async def _async_fetch_payload(self):
+        """Fetch the overview, logging in again once if the token is rejected.
+
+        A revoked or expired token is not a reason to ask the user for new
+        credentials, only a rejected login is.
+        """
+        try:
+            return await self.executor.async_call(self.client.get_brewery_overview_payload)
+        except Exception as err:
+            if not is_auth_error(err):
+                raise
+            _LOGGER.debug("MiniBrew rejected the token, logging in again: %s", err)
+        self.client.drop_token()
+        return await self.executor.async_call(self.client.get_brewery_overview_payload)
+
+    @callback
+    def async_update_listeners(self):
+        """Update all listeners, timing the entity fan-out while profiling."""
+        profiler = self.profiler
+        if profiler is None:
+            super().async_update_listeners()
+            return
+
+        with profiler.phase("fan_out"):
+            super().async_update_listeners()
+        profiler.end_cycle()
+        if profiler.done:
+            self.profiler = None
+            self.hass.async_create_task(self._async_finish_profile(profiler))
+
+    def async_start_profile(self, profiler):
+        """Profile the next refresh cycles with the given profiler."""
+        if self.profiler is not None:
+            self.profiler.abort()
+        self.profiler = profiler
+        profiler.start()
+
+    async def _async_finish_profile(self, profiler):
+        """Write the profile to disk and summarize it in a persistent notification."""
+        memory_snapshot = profiler.take_memory_snapshot()
+        try:
+            _, summary = await self.hass.async_add_executor_job(profiler.write_results, memory_snapshot)
+        except OSError as err:
+            _LOGGER.error("Could not write MiniBrew profile: %s", err)
+            return
+        persistent_notification.async_create(
+            self.hass,
+            summary,
+            title=f"MiniBrew refresh profile ({self.config_entry.title})",
+            notification_id=f"{DOMAIN}_profile_{self.config_entry.entry_id}",
+        )
+
+    def _async_handle_auth_failure(self, err):
+        """Start reauthentication and keep serving the last good data meanwhile."""
+        if self.data is None:
+            raise ConfigEntryAuthFailed(f"MiniBrew rejected the credentials: {err}") from err
+
+        if not self.reauth_pending:
+            _LOGGER.warning("MiniBrew rejected the credentials, keeping last known data until reauthenticated: %s", err)
+            self.reauth_pending = True
+            self._interval_before_reauth = self.update_interval
+            self.config_entry.async_start_reauth(self.hass)
+        # Back off so the account is not hammered with bad credentials, but keep
+        # trying in case the rejection was a glitch on the MiniBrew side
+        if self.update_interval is not None:
+            self.update_interval = min(self.update_interval * 2, timedelta(seconds=REAUTH_MAX_INTERVAL))
+        return self.data
+
+    def _async_resume_after_reauth(self):
+        """Restore the refresh interval and drop the reauth prompt once a fetch succeeds again."""
+        _LOGGER.info("MiniBrew accepted the credentials again, resuming normal polling")
+        self.reauth_pending = False
+        self.update_interval = self._interval_before_reauth
+        flow_manager = self.hass.config_entries.flow
+        for flow in flow_manager.async_progress_by_handler(
+            DOMAIN, match_context={"source": SOURCE_REAUTH, "entry_id": self.config_entry.entry_id}
+        ):
+            flow_manager.async_abort(flow["flow_id"])
+
+    async def async_update_credentials(self, username: str, password: str):
+        """Use new credentials on the live client and resume polling straight away."""
+        self.client.set_credentials(username, password)
+        if self.reauth_pending:
+            self.reauth_pending = False
+            self.update_interval = self._interval_before_reauth
+        await self.async_refresh()
+
+    def _log_failure(self, message, *args):
+        """Log a failed refresh as a warning once per FAILURE_LOG_EVERY consecutive failures."""
+        self.failure_streak += 1
+        level = logging.WARNING if (self.failure_streak - 1) % FAILURE_LOG_EVERY == 0 else logging.DEBUG
+        _LOGGER.log(level, message + " (%s consecutive failure(s))", *args, self.failure_streak)
+
+    def _async_quarantine(self, data, failures):
+        """Quarantine undecodable device records and keep serving their last good values."""
+        failing = set()
+        for group_name, position, raw, err in failures:
+            serial_number = raw.get("serial_number") if isinstance(raw, dict) else None
+            if serial_number:
+                key = serial_number
+            elif position is None:
+                key = group_name
+            else:
+                # Unidentified records are told apart by their position in the group
+                key = f"{group_name}:{position}"
+            failing.add(key)
+            self.decode_failures += 1
+
+            details = self.quarantined.get(key)
+            if details is None:
+                _LOGGER.warning("Quarantining malformed MiniBrew device record %s: %s", key, err)
+                details = self.quarantined[key] = {"group": group_name, "count": 0}
+                self._async_create_quarantine_issue(key, err)
+            details["count"] += 1
+            details["error"] = str(err)
+
+            if serial_number:
+                last_good = [self.device_index[serial_number]] if serial_number in self.device_index else []
+            elif position is None:
+                # The whole group was unreadable, keep every device it held
+                last_good = [indexed for indexed in self.device_index.values() if indexed.group == group_name]
+            else:
+                last_good = []
+            for last_group, device, _ in last_good:
+                if not hasattr(data, last_group):
+                    setattr(data, last_group, [])
+                getattr(data, last_group).append(device)
+
+        for key in list(self.quarantined):
+            if key not in failing:
+                _LOGGER.info("MiniBrew device record %s decodes again, releasing quarantine", key)
+                del self.quarantined[key]
+                self._async_delete_quarantine_issue(key)
+
+    def _async_create_quarantine_issue(self, key, err):
+        """Raise a repair issue for a quarantined device record."""
+        ir.async_create_issue(
+            self.hass,
+            DOMAIN,
+            f"malformed_device_{key}",
+            is_fixable=False,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key="malformed_device",
+            translation_placeholders={"device": key, "error": str(err)},
+        )
+
+    def _async_delete_quarantine_issue(self, key):
+        """Remove the repair issue of a released device record."""
+        ir.async_delete_issue(self.hass, DOMAIN, f"malformed_device_{key}")
+
+    def _async_update_index(self, data):
+        """Rebuild the serial number index that entities and trackers read from."""
+        self.device_index = {
+            device.serial_number: IndexedDevice(group_name, device, _device_to_dict(device))
+            for group_name, devices in data.__dict__.items()
+            for device in devices
+        }
+
+    async def async_load_stage_trackers(self):
+        """Restore stage trackers saved before the last restart."""
+        stored = await self._stage_store.async_load() or {}
+        self.stage_trackers = {
+            serial_number: StageTracker.from_dict(tracker)
+            for serial_number, tracker in stored.items()
+        }
+
+    def _async_update_stage_trackers(self):
+        """Advance the stage tracker of every Craft device and save them after a transition."""
+        now = time.time()
+        changed = False
+        for serial_number in list(self.stage_trackers):
+            # Drop devices that left the account or are no longer tracked
+            if serial_number not in self.known_devices or (
+                self.tracked_devices and serial_number not in self.tracked_devices
+            ):
+                del self.stage_trackers[serial_number]
+                changed = True
+        for serial_number, indexed in self.device_index.items():
+            if indexed.device.device_type != 0:
+                continue
+            tracker = self.stage_trackers.get(serial_number)
+            if tracker is None:
+                tracker = self.stage_trackers[serial_number] = StageTracker()
+            changed |= tracker.update(
+                indexed.group, indexed.device.stage, indexed.device.session_id, now, self._stage_max_gap
+            )
+        # Between transitions only save now and then, so a restart loses little running time
+        if changed or self._stage_saved_at is None or now - self._stage_saved_at >= STAGE_SAVE_INTERVAL:
+            self._stage_saved_at = now
+            self._async_save_stage_trackers()
+
+    def _async_save_stage_trackers(self):
+        """Save the stage trackers in the background."""
+        # A delay of 0 writes on the next loop iteration, coalescing saves queued in the same cycle
+        self._stage_store.async_delay_save(self._stage_data_to_save, 0)
+
+    async def _async_flush_stage_trackers(self):
+        """Write the stage trackers to storage now."""
+        await self._stage_store.async_save(self._stage_data_to_save())
+
+    def _async_record_curves(self):
+        """Append the current and target temperature of every device to the curve cache."""
+        now = time.time()
+        for serial_number, indexed in self.device_index.items():
+            current = indexed.attributes.get("current_temp")
+            target = indexed.attributes.get("target_temp")
+            if current is None and target is None:
+                continue
+            self.curves.record(serial_number, now, current, target)
+
+    def _stage_data_to_save(self):
+        return {serial_number: tracker.as_dict() for serial_number, tracker in self.stage_trackers.items()}
+
+    def _async_fire_transition_events(self, data):
+        """Diff the new overview against the previous one and fire an event per transition."""
+        snapshot = snapshot_overview(data)
+        previous, self.snapshot = self.snapshot, snapshot
+        if not previous:
+            return
+
+        device_registry = dr.async_get(self.hass)
+        for event_type, serial_number, event_data in diff_snapshots(previous, snapshot):
+            device = device_registry.async_get_device(identifiers={(DOMAIN, serial_number)})
+            self._async_fire_event(
+                event_type,
+                {
+                    "device_id": device.id if device else None,
+                    "serial_number": serial_number,
+                    **event_data,
+                },
+            )
+
+    def _async_fire_event(self, event_type, event_data):
+        """Fire one device transition event on the bus."""
+        self.hass.bus.async_fire(event_type, event_data)
+
+    async def async_shutdown(self):
+        """Stop the coordinator, save the stage trackers and release the client executor."""
+        await super().async_shutdown()
+        await self._async_flush_stage_trackers()
+        if self.profiler is not None:
+            self.profiler.abort()
+            self.profiler = None
+        self.executor.shutdown()
+
+    async def _async_capture(self, data):
+        """Append the fetched overview to the capture file without failing the refresh."""
+        try:
+            await self.hass.async_add_executor_job(self.recorder.record, data)
+        except (OSError, TypeError, ValueError) as err:
+            _LOGGER.warning("Could not capture overview to %s: %s", self.recorder.path, err)
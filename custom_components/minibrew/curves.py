@@ -0,0 +1,197 @@
+"""In-memory temperature curves and server-side downsampling for dashboards."""
+import logging
+from collections import deque
+from datetime import timedelta
+
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .const import CURVE_BACKFILL_DAYS, CURVE_MAX_POINTS, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# device_type -> unique ids of the (current, target) temperature sensors
+_SENSOR_UNIQUE_IDS = {
+    0: ("{serial}_current_temperature", "{serial}_target_temperature"),
+    1: ("{serial}_Temperature", "{serial}_Target Temperature"),
+}
+
+
+def lttb(points: list, threshold: int) -> list:
+    """Downsample (x, y) points with Largest-Triangle-Three-Buckets."""
+    count = len(points)
+    if threshold >= count or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = (count - 2) / (threshold - 2)
+    selected = 0
+    for bucket in range(threshold - 2):
+        # Average of the next bucket is the third corner of the triangle
+        next_start = int((bucket + 1) * bucket_size) + 1
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        next_points = points[next_start:next_end]
+        avg_x = sum(point[0] for point in next_points) / len(next_points)
+        avg_y = sum(point[1] for point in next_points) / len(next_points)
+
+        anchor_x, anchor_y = points[selected]
+        max_area = -1.0
+        for index in range(int(bucket * bucket_size) + 1, next_start):
+            x, y = points[index]
+            area = abs((anchor_x - avg_x) * (y - anchor_y) - (anchor_x - x) * (avg_y - anchor_y))
+            if area > max_area:
+                max_area = area
+                candidate = index
+        sampled.append(points[candidate])
+        selected = candidate
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def minmax(points: list, threshold: int) -> list:
+    """Downsample (x, y) points by keeping the minimum and maximum of each bucket."""
+    count = len(points)
+    buckets = threshold // 2
+    if threshold >= count or buckets < 1:
+        return list(points)
+
+    sampled = []
+    bucket_size = count / buckets
+    for bucket in range(buckets):
+        chunk = points[int(bucket * bucket_size):int((bucket + 1) * bucket_size)]
+        if not chunk:
+            continue
+        low = min(chunk, key=lambda point: point[1])
+        high = max(chunk, key=lambda point: point[1])
+        if low is high:
+            sampled.append(low)
+        elif low[0] <= high[0]:
+            sampled.extend((low, high))
+        else:
+            sampled.extend((high, low))
+    return sampled
+
+
+DOWNSAMPLERS = {"lttb": lttb, "minmax": minmax}
+
+
+def downsample_curve(points: list, start: float, end: float, threshold: int, method: str) -> dict:
+    """Return the current and target series between start and end, downsampled. Runs in the executor."""
+    current = [(ts, cur) for ts, cur, _ in points if start <= ts <= end and cur is not None]
+    target = [(ts, tgt) for ts, _, tgt in points if start <= ts <= end and tgt is not None]
+    downsampler = DOWNSAMPLERS[method]
+    return {
+        "current": [[round(ts, 1), value] for ts, value in downsampler(current, threshold)],
+        "target": [[round(ts, 1), value] for ts, value in downsampler(target, threshold)],
+    }
+
+
+class TemperatureCurveCache:
+    """Bounded per-device history of current and target temperature.
+
+    Runs of identical readings are collapsed into their first and last point,
+    so long stable stretches (target temperatures especially) cost two
+    entries no matter how long they last.
+    """
+
+    def __init__(self, max_points: int = CURVE_MAX_POINTS):
+        """Initialize the cache."""
+        self.max_points = max_points
+        # serial number -> deque of [timestamp, current_temp, target_temp]
+        self._curves = {}
+
+    def __contains__(self, serial_number) -> bool:
+        """Return True if readings are cached for the device."""
+        return serial_number in self._curves
+
+    def record(self, serial_number: str, timestamp: float, current, target):
+        """Append one reading for a device."""
+        curve = self._curves.get(serial_number)
+        if curve is None:
+            curve = self._curves[serial_number] = deque(maxlen=self.max_points)
+        if (
+            len(curve) >= 2
+            and curve[-1][1:] == [current, target]
+            and curve[-2][1:] == [current, target]
+            and timestamp >= curve[-1][0]
+        ):
+            curve[-1][0] = timestamp
+            return
+        curve.append([timestamp, current, target])
+
+    def backfill(self, serial_number: str, readings: list):
+        """Prepend older [timestamp, current, target] readings, e.g. from the recorder."""
+        curve = self._curves.get(serial_number)
+        first = curve[0][0] if curve else None
+        older = [reading for reading in readings if first is None or reading[0] < first]
+        merged = older + list(curve or [])
+        self._curves[serial_number] = deque(merged[-self.max_points:], maxlen=self.max_points)
+
+    def first_timestamp(self, serial_number: str):
+        """Return the timestamp of the oldest cached reading of a device."""
+        curve = self._curves.get(serial_number)
+        return curve[0][0] if curve else None
+
+    def points(self, serial_number: str) -> list:
+        """Return a copy of the cached readings of a device."""
+        return [list(point) for point in self._curves.get(serial_number, ())]
+
+    def as_dict(self) -> dict:
+        """Return cache telemetry."""
+        return {serial_number: len(curve) for serial_number, curve in self._curves.items()}
+
+
+def _merge_series(current_states: list, target_states: list) -> list:
+    """Merge two recorder state lists into [timestamp, current, target] rows."""
+    changes = []
+    for column, states in ((1, current_states), (2, target_states)):
+        for state in states:
+            try:
+                value = float(state.state)
+            except ValueError:
+                continue
+            changes.append((state.last_changed.timestamp(), column, value))
+    changes.sort()
+
+    rows = []
+    row = [None, None, None]
+    for timestamp, column, value in changes:
+        row = [timestamp, row[1], row[2]]
+        row[column] = value
+        rows.append(row)
+    return rows
+
+
+async def async_backfill_from_recorder(hass, cache: TemperatureCurveCache, device_index: dict):
+    """Seed the cache with recorder history so curves survive a restart.
+
+    Runs once per setup. Every later reading comes from the coordinator.
+    """
+    if "recorder" not in hass.config.components:
+        return
+    from homeassistant.components.recorder import get_instance, history
+
+    entity_registry = er.async_get(hass)
+    start = dt_util.utcnow() - timedelta(days=CURVE_BACKFILL_DAYS)
+    for serial_number, indexed in device_index.items():
+        unique_ids = _SENSOR_UNIQUE_IDS.get(indexed.device.device_type)
+        if unique_ids is None:
+            continue
+        entity_ids = [
+            entity_registry.async_get_entity_id("sensor", DOMAIN, unique_id.format(serial=serial_number))
+            for unique_id in unique_ids
+        ]
+        series = []
+        for entity_id in entity_ids:
+            if entity_id is None:
+                series.append([])
+                continue
+            states = await get_instance(hass).async_add_executor_job(
+                history.state_changes_during_period, hass, start, None, entity_id
+            )
+            series.append(states.get(entity_id, []))
+        rows = _merge_series(*series)
+        if rows:
+            cache.backfill(serial_number, rows)
+            _LOGGER.debug("Backfilled %s temperature readings for %s from the recorder", len(rows), serial_number)
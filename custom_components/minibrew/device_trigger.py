@@ -0,0 +1,59 @@
+"""Device triggers for MiniBrew devices."""
+import voluptuous as vol
+from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
+from homeassistant.components.homeassistant.triggers import event as event_trigger
+from homeassistant.const import CONF_DEVICE_ID, CONF_DOMAIN, CONF_PLATFORM, CONF_TYPE
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DOMAIN,
+    EVENT_CLEANED,
+    EVENT_CLEANING_NEEDED,
+    EVENT_DEVICE_OFFLINE,
+    EVENT_DEVICE_ONLINE,
+    EVENT_GROUP_CHANGED,
+    EVENT_STAGE_CHANGED,
+    EVENT_USER_ACTION_CLEARED,
+    EVENT_USER_ACTION_RAISED,
+)
+
+# Device trigger type -> event fired by the coordinator
+TRIGGER_TYPES = {
+    "group_changed": EVENT_GROUP_CHANGED,
+    "stage_changed": EVENT_STAGE_CHANGED,
+    "user_action_raised": EVENT_USER_ACTION_RAISED,
+    "user_action_cleared": EVENT_USER_ACTION_CLEARED,
+    "cleaning_needed": EVENT_CLEANING_NEEDED,
+    "cleaned": EVENT_CLEANED,
+    "online": EVENT_DEVICE_ONLINE,
+    "offline": EVENT_DEVICE_OFFLINE,
+}
+
+TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend({
+    vol.Required(CONF_TYPE): vol.In(TRIGGER_TYPES),
+})
+
+
+async def async_get_triggers(hass: HomeAssistant, device_id: str) -> list[dict]:
+    """List the triggers available for a MiniBrew device."""
+    return [
+        {
+            CONF_PLATFORM: "device",
+            CONF_DOMAIN: DOMAIN,
+            CONF_DEVICE_ID: device_id,
+            CONF_TYPE: trigger_type,
+        }
+        for trigger_type in TRIGGER_TYPES
+    ]
+
+
+async def async_attach_trigger(hass: HomeAssistant, config, action, trigger_info):
+    """Attach a trigger by listening for the matching coordinator event."""
+    event_config = event_trigger.TRIGGER_SCHEMA({
+        event_trigger.CONF_PLATFORM: "event",
+        event_trigger.CONF_EVENT_TYPE: TRIGGER_TYPES[config[CONF_TYPE]],
+        event_trigger.CONF_EVENT_DATA: {CONF_DEVICE_ID: config[CONF_DEVICE_ID]},
+    })
+    return await event_trigger.async_attach_trigger(
+        hass, event_config, action, trigger_info, platform_type="device"
+    )
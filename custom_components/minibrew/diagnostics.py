@@ -0,0 +1,31 @@
+"""Diagnostics support for MiniBrew."""
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {CONF_USERNAME, CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, config_entry: ConfigEntry) -> dict:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    return {
+        "entry": {
+            "data": async_redact_data(config_entry.data, TO_REDACT),
+            "options": dict(config_entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": str(coordinator.update_interval),
+            "refresh_count": coordinator.refresh_count,
+            "failure_streak": coordinator.failure_streak,
+            "last_refresh": coordinator.last_refresh_stats,
+            "executor": coordinator.executor.as_dict(),
+            "curve_points": coordinator.curves.as_dict(),
+            "decode_failures": coordinator.decode_failures,
+            "quarantined": coordinator.quarantined,
+        },
+    }
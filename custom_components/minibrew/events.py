@@ -0,0 +1,75 @@
+"""Detect MiniBrew device transitions by diffing consecutive overview snapshots."""
+from .const import (
+    EVENT_CLEANED,
+    EVENT_CLEANING_NEEDED,
+    EVENT_DEVICE_OFFLINE,
+    EVENT_DEVICE_ONLINE,
+    EVENT_GROUP_CHANGED,
+    EVENT_STAGE_CHANGED,
+    EVENT_USER_ACTION_CLEARED,
+    EVENT_USER_ACTION_RAISED,
+)
+from .helpers import _device_to_dict
+
+
+def snapshot_overview(overview) -> dict:
+    """Index an overview by serial number, keeping only the fields that drive events."""
+    snapshot = {}
+    for group_name, devices in overview.__dict__.items():
+        for device in devices or []:
+            device_dict = _device_to_dict(device)
+            serial_number = device_dict.get("serial_number")
+            if not serial_number:
+                continue
+            snapshot[serial_number] = {
+                "group": group_name,
+                "stage": device_dict.get("stage"),
+                "user_action": device_dict.get("user_action"),
+                "needs_acid_cleaning": bool(device_dict.get("needs_acid_cleaning")),
+                "online": bool(device_dict.get("online")),
+            }
+    return snapshot
+
+
+def _action_raised(action) -> bool:
+    """Return True if a user_action value asks the user to do something."""
+    return action is not None and action != 0
+
+
+def diff_snapshots(previous: dict, current: dict) -> list[tuple[str, str, dict]]:
+    """Return (event_type, serial_number, data) for every transition between two snapshots.
+
+    Devices that appear or disappear between snapshots produce no events.
+    """
+    transitions = []
+    for serial_number, new in current.items():
+        old = previous.get(serial_number)
+        if old is None:
+            continue
+
+        if old["group"] != new["group"]:
+            transitions.append((EVENT_GROUP_CHANGED, serial_number, {"old_group": old["group"], "new_group": new["group"]}))
+
+        if old["stage"] != new["stage"]:
+            transitions.append((EVENT_STAGE_CHANGED, serial_number, {"old_stage": old["stage"], "new_stage": new["stage"]}))
+
+        was_raised = _action_raised(old["user_action"])
+        is_raised = _action_raised(new["user_action"])
+        if is_raised and old["user_action"] != new["user_action"]:
+            transitions.append(
+                (EVENT_USER_ACTION_RAISED, serial_number, {"old_user_action": old["user_action"], "new_user_action": new["user_action"]})
+            )
+        elif was_raised and not is_raised:
+            transitions.append(
+                (EVENT_USER_ACTION_CLEARED, serial_number, {"old_user_action": old["user_action"], "new_user_action": new["user_action"]})
+            )
+
+        if old["needs_acid_cleaning"] != new["needs_acid_cleaning"]:
+            event_type = EVENT_CLEANING_NEEDED if new["needs_acid_cleaning"] else EVENT_CLEANED
+            transitions.append((event_type, serial_number, {"old_needs_cleaning": old["needs_acid_cleaning"], "new_needs_cleaning": new["needs_acid_cleaning"]}))
+
+        if old["online"] != new["online"]:
+            event_type = EVENT_DEVICE_ONLINE if new["online"] else EVENT_DEVICE_OFFLINE
+            transitions.append((event_type, serial_number, {"old_online": old["online"], "new_online": new["online"]}))
+
+    return transitions
@@ -0,0 +1,102 @@
+"""Dedicated, bounded executor for blocking MiniBrew client calls."""
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from .const import CLIENT_CALL_TIMEOUT, CLIENT_MAX_IN_FLIGHT, CLIENT_MAX_WORKERS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ClientCallTimeout(Exception):
+    """Raised when a client call does not finish before its deadline."""
+
+
+class ClientBusy(Exception):
+    """Raised when too many client calls are already in flight."""
+
+
+class ClientExecutor:
+    """Run blocking client calls on a private thread pool with a per-call deadline.
+
+    Up to max_in_flight calls are accepted, more than there are workers, so
+    calls queue behind busy workers and queue_depth shows the backlog. A call
+    that times out keeps its worker thread until the underlying request
+    returns, so it still counts towards the in-flight cap. Requests carry their
+    own socket timeout (CLIENT_REQUEST_TIMEOUT), so such a worker is freed
+    shortly after the deadline instead of never. It never touches Home
+    Assistant's shared executor.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int = CLIENT_MAX_WORKERS,
+        max_in_flight: int = CLIENT_MAX_IN_FLIGHT,
+        timeout: float = CLIENT_CALL_TIMEOUT,
+    ):
+        """Initialize the executor."""
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"minibrew_{name}")
+        self.in_flight = 0
+        self.running = 0
+        self.calls = 0
+        self.timeouts = 0
+        self.rejected = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of submitted calls still waiting for a worker."""
+        return self.in_flight - self.running
+
+    async def async_call(self, func, *args, timeout: float | None = None):
+        """Run func(*args) on the executor and return its result."""
+        if self.in_flight >= self.max_in_flight:
+            self.rejected += 1
+            raise ClientBusy(f"{self.in_flight} MiniBrew client call(s) already in flight")
+
+        loop = asyncio.get_running_loop()
+
+        def _run():
+            loop.call_soon_threadsafe(self._call_started)
+            return func(*args)
+
+        self.in_flight += 1
+        self.calls += 1
+        future = self._executor.submit(_run)
+        future.add_done_callback(lambda done: loop.call_soon_threadsafe(self._call_finished, done))
+
+        deadline = self.timeout if timeout is None else timeout
+        try:
+            # Cancelling the wrapper (deadline or caller cancelled) drops the
+            # result and cancels the call if it has not started yet.
+            return await asyncio.wait_for(asyncio.wrap_future(future), deadline)
+        except asyncio.TimeoutError as err:
+            self.timeouts += 1
+            raise ClientCallTimeout(f"MiniBrew client call timed out after {deadline}s") from err
+
+    def _call_started(self):
+        self.running += 1
+
+    def _call_finished(self, future):
+        self.in_flight -= 1
+        if not future.cancelled():
+            self.running -= 1
+
+    def as_dict(self) -> dict:
+        """Return executor telemetry."""
+        return {
+            "in_flight": self.in_flight,
+            "running": self.running,
+            "queue_depth": self.queue_depth,
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "max_in_flight": self.max_in_flight,
+            "timeout": self.timeout,
+        }
+
+    def shutdown(self):
+        """Stop accepting calls and drop any that have not started."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
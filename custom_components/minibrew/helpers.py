@@ -0,0 +1,112 @@
+"""Helpers shared by the MiniBrew coordinator and platforms."""
+from dataclasses import asdict, fields, is_dataclass
+from typing import NamedTuple
+
+from pymbrewclient import BreweryOverview, Device
+
+
+def _device_to_dict(device):
+    if isinstance(device, dict):
+        return device
+    if isinstance(device, Device):
+        if is_dataclass(device):
+            return asdict(device)
+        return device.__dict__
+    if hasattr(device, "__dict__"):
+        return device.__dict__
+    return {}
+
+
+# Fields a device record must carry to be indexed and get entities
+REQUIRED_DEVICE_FIELDS = ("serial_number", "device_type")
+DEVICE_FIELDS = tuple(field.name for field in fields(Device))
+OVERVIEW_GROUPS = tuple(field.name for field in fields(BreweryOverview))
+
+
+class DeviceDecodeError(Exception):
+    """Raised when a device record in the overview cannot be decoded."""
+
+
+def decode_device(raw) -> Device:
+    """Decode one raw device record, tolerating unknown and missing optional keys."""
+    if not isinstance(raw, dict):
+        raise DeviceDecodeError(f"expected an object, got {type(raw).__name__}")
+    missing = [key for key in REQUIRED_DEVICE_FIELDS if raw.get(key) is None]
+    if missing:
+        raise DeviceDecodeError(f"missing required field(s): {', '.join(missing)}")
+    try:
+        return Device(**{key: raw.get(key) for key in DEVICE_FIELDS})
+    except (TypeError, ValueError) as err:
+        raise DeviceDecodeError(str(err)) from err
+
+
+def filter_payload(payload: dict, tracked: set | None):
+    """Drop device records that are not tracked, before any decoding work.
+
+    Returns the filtered payload and {serial number: title} for every device
+    seen, tracked or not, so the options flow can offer them.
+    """
+    seen = {}
+    if not isinstance(payload, dict):
+        return payload, seen
+
+    filtered = {}
+    for group_name, raw_devices in payload.items():
+        if not isinstance(raw_devices, list):
+            # Not a device group, decode_overview decides what to do with it
+            filtered[group_name] = raw_devices
+            continue
+        kept = []
+        for raw in raw_devices:
+            serial_number = raw.get("serial_number") if isinstance(raw, dict) else None
+            if serial_number:
+                seen[serial_number] = raw.get("title") or serial_number
+            if not tracked or serial_number is None or serial_number in tracked:
+                kept.append(raw)
+        filtered[group_name] = kept
+    return filtered, seen
+
+
+def decode_overview(payload: dict):
+    """Decode a raw overview payload device by device.
+
+    Returns the decoded BreweryOverview and a list of (group, position, raw
+    record, error) for every record that could not be decoded. The position
+    is None when the whole group could not be read. Groups not known to
+    pymbrewclient are kept as extra attributes on the overview. Top-level
+    values that are not lists are skipped, and reported as a failure when a
+    known group holds one.
+    """
+    if not isinstance(payload, dict):
+        raise DeviceDecodeError(f"expected an overview object, got {type(payload).__name__}")
+
+    groups = {}
+    failures = []
+    for group_name, raw_devices in payload.items():
+        if raw_devices is None:
+            raw_devices = []
+        elif not isinstance(raw_devices, list):
+            if group_name in OVERVIEW_GROUPS:
+                error = DeviceDecodeError(f"expected a list, got {type(raw_devices).__name__}")
+                failures.append((group_name, None, raw_devices, error))
+            continue
+        devices = []
+        for position, raw in enumerate(raw_devices):
+            try:
+                devices.append(decode_device(raw))
+            except DeviceDecodeError as err:
+                failures.append((group_name, position, raw, err))
+        groups[group_name] = devices
+
+    overview = BreweryOverview(**{name: groups.pop(name, []) for name in OVERVIEW_GROUPS})
+    for group_name, devices in groups.items():
+        setattr(overview, group_name, devices)
+    return overview, failures
+
+
+class IndexedDevice(NamedTuple):
+    """A device in the serial number index kept by the coordinator."""
+
+    group: str
+    device: Device
+    attributes: dict
@@ -0,0 +1,142 @@
+"""On-demand profiling of coordinator refresh cycles."""
+import cProfile
+import io
+import logging
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+_LOGGER = logging.getLogger(__name__)
+
+# Phases reported in the summary, in refresh order
+PHASES = ("fetch", "capture", "decode", "index", "events", "fan_out")
+
+
+def profiler_in_use() -> bool:
+    """Return True if another profiler is active in this process."""
+    monitoring = getattr(sys, "monitoring", None)
+    if monitoring is not None:
+        return monitoring.get_tool(monitoring.PROFILER_ID) is not None
+    return sys.getprofile() is not None
+
+
+class RefreshProfiler:
+    """Profile the next N refresh cycles of one coordinator.
+
+    The coordinator only holds a profiler while a run is active, so the
+    instrumentation costs nothing otherwise. cProfile is paused while the
+    fetch waits on the executor, to keep unrelated event loop work out of
+    the statistics; the fetch is reported as wall time instead.
+    """
+
+    def __init__(self, cycles: int, memory: bool, path_prefix: str):
+        """Initialize the profiler."""
+        self.cycles = cycles
+        self.memory = memory
+        self.path_prefix = path_prefix
+        self.completed = 0
+        # Set when cProfile could not be enabled because another profiler took over
+        self.interrupted = False
+        self.phase_times = {phase: [] for phase in PHASES}
+        self._profile = cProfile.Profile()
+        self._in_cycle = False
+        self._started_tracemalloc = False
+
+    def start(self):
+        """Start memory sampling if requested."""
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            self._started_tracemalloc = True
+
+    @property
+    def done(self) -> bool:
+        """Return True once all requested cycles were profiled."""
+        return self.completed >= self.cycles
+
+    def begin_cycle(self):
+        """Start profiling a refresh cycle."""
+        if self._in_cycle:
+            # The previous cycle never reached the listeners (failed refresh)
+            self._profile.disable()
+        self._in_cycle = True
+        self._enable()
+
+    def _enable(self):
+        """Enable cProfile unless another profiler is active."""
+        if self.interrupted:
+            return
+        try:
+            self._profile.enable()
+        except ValueError:
+            # Python 3.12+ allows one profiler at a time, e.g. Home Assistant's profiler integration
+            self.interrupted = True
+
+    @contextmanager
+    def phase(self, name: str, paused: bool = False):
+        """Time one phase of the cycle, optionally with cProfile paused."""
+        if paused:
+            self._profile.disable()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[name].append(time.perf_counter() - started)
+            if paused:
+                self._enable()
+
+    def end_cycle(self):
+        """Stop profiling the current refresh cycle."""
+        if not self._in_cycle:
+            return
+        self._profile.disable()
+        self._in_cycle = False
+        self.completed += 1
+
+    def cancel_cycle(self):
+        """Stop profiling a failed refresh cycle without counting it."""
+        self._profile.disable()
+        self._in_cycle = False
+
+    def abort(self):
+        """Stop profiling without writing results."""
+        self._profile.disable()
+        self._in_cycle = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+    def take_memory_snapshot(self):
+        """Take a tracemalloc snapshot and stop sampling if this run started it."""
+        if not self.memory or not tracemalloc.is_tracing():
+            return None
+        snapshot = tracemalloc.take_snapshot()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        return snapshot
+
+    def write_results(self, memory_snapshot) -> tuple[str, str]:
+        """Write the statistics to disk and return (files, summary). Runs in the executor."""
+        stats_path = f"{self.path_prefix}.pstats"
+        self._profile.dump_stats(stats_path)
+        files = [stats_path]
+
+        lines = [f"Profiled {self.completed} refresh cycle(s).", "", "Mean time per phase:"]
+        for phase, times in self.phase_times.items():
+            if times:
+                lines.append(f"- {phase}: {1000 * sum(times) / len(times):.2f} ms")
+
+        output = io.StringIO()
+        pstats.Stats(self._profile, stream=output).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(10)
+        lines.extend(["", "Top functions by cumulative time:", "```", output.getvalue().strip(), "```"])
+
+        if memory_snapshot is not None:
+            memory_path = f"{self.path_prefix}.tracemalloc"
+            memory_snapshot.dump(memory_path)
+            files.append(memory_path)
+            lines.extend(["", "Top allocations:"])
+            for stat in memory_snapshot.statistics("lineno")[:10]:
+                lines.append(f"- {stat}")
+
+        lines.extend(["", "Files:"] + [f"- `{path}`" for path in files])
+        return files, "\n".join(lines)
@@ -1,127 +1,58 @@
 import logging
-from dataclasses import asdict, is_dataclass
-from datetime import timedelta
 
 from homeassistant.components.sensor import SensorEntity
+from homeassistant.core import callback
 from homeassistant.helpers.entity import EntityCategory
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from pymbrewclient import BreweryOverview, Device
+from homeassistant.util import dt as dt_util
+from pymbrewclient import Device
 
-from .const import DOMAIN
+from .const import CONF_SENSOR_KINDS, DOMAIN, SENSOR_KINDS
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def _device_to_dict(device):
-    if isinstance(device, dict):
-        return device
-    if isinstance(device, Device):
-        if is_dataclass(device):
-            return asdict(device)
-        return device.__dict__
-    if hasattr(device, "__dict__"):
-        return device.__dict__
-    return {}
+def _timestamp_to_iso(timestamp):
+    """Return a POSIX timestamp as an ISO 8601 string, or None."""
+    if timestamp is None:
+        return None
+    return dt_util.utc_from_timestamp(timestamp).isoformat()
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up MiniBrew sensors from a config entry."""
-    client = hass.data[DOMAIN][config_entry.entry_id]  # Get the BreweryClient instance
-    sensors = []
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]  # Shared MiniBrewDataUpdateCoordinator
+    sensor_kinds = set(config_entry.options.get(CONF_SENSOR_KINDS, SENSOR_KINDS))
+    craft_sensors = [cls for kind, cls in CRAFT_SENSORS if kind in sensor_kinds]
+    keg_sensors = [cls for kind, cls in KEG_SENSORS if kind in sensor_kinds]
     added_devices = set()
 
-    # Create a DataUpdateCoordinator
-    coordinator = MiniBrewDataUpdateCoordinator(hass, client, config_entry)
-    await coordinator.async_config_entry_first_refresh()
-
+    _LOGGER.debug("Setting up sensors for %s devices", len(coordinator.device_index))
 
-    _LOGGER.debug(f"Brewery overview: {coordinator}")
-    
-    # Function to add new sensors dynamically
+    # Function to add sensors for devices not seen before. The coordinator
+    # only indexes tracked devices, so untracked ones never get entities.
+    @callback
     def add_new_sensors():
-        # Track devices currently in the API response
-        current_devices = set()
-        
-        for state, devices in coordinator.data.__dict__.items():  # Access states dynamically
-            for device_data in devices:
-                device_dict = _device_to_dict(device_data)
-                serial_number = device_dict.get("serial_number")
-                if not serial_number:
-                    continue
-                
-                current_devices.add(serial_number)
-                
-                # Check if the device has already been added
-                if serial_number in added_devices:
-                    continue
-
-                # Convert the raw dictionary to a Device object
-                device = device_data if isinstance(device_data, Device) else Device(**device_dict)
-
-                # Add sensors for MiniBrew devices
-                if device.device_type == 0:  # Craft device
-                    sensors.append(CraftSensorCurrentTemperatureSensor(coordinator, device, state))
-                    sensors.append(CraftSensorTargetTemperatureSensor(coordinator, device, state))
-                    sensors.append(CraftSensorOnlineStatusSensor(coordinator, device, state))
-                    sensors.append(CraftSensorIsUpdatingSensor(coordinator, device, state))
-                    sensors.append(CraftSensorBrewStageSensor(coordinator, device, state))
-                    sensors.append(CraftSensorTimeInStageSensor(coordinator, device, state))
-                    sensors.append(CraftSensorCurrentStageSensor(coordinator, device, state))
-                    sensors.append(CraftSensorNeedsCleaningSensor(coordinator, device, state))
-                    sensors.append(CraftUserActionRequiredSensor(coordinator, device, state))
-                # Add sensors for Keg devices
-                elif device.device_type == 1:  # Keg device
-                    sensors.append(KegCurrentTemperatureSensor(coordinator, device, state))
-                    sensors.append(KegTargetTemperatureSensor(coordinator, device, state))
-                    sensors.append(KegBeerStyleSensor(coordinator, device, state))
-                    sensors.append(KegBeerNameSensor(coordinator, device, state))
-                    sensors.append(KegOnlineStatusSensor(coordinator, device, state))
-                    sensors.append(KegIsUpdatingSensor(coordinator, device, state))
-                    sensors.append(KegNeedsCleaningSensor(coordinator, device, state))
-                    sensors.append(KegActionRequiredSensor(coordinator, device, state))
-                # Mark the device as added
-                added_devices.add(serial_number)
-        
-        # Remove devices that are no longer in the API response
-        # This allows offline/reconnecting devices to be re-registered
-        added_devices.intersection_update(current_devices)
+        sensors = []
+        for serial_number, indexed in coordinator.device_index.items():
+            if serial_number in added_devices:
+                continue
+
+            device = indexed.device
+            if device.device_type == 0:  # Craft device
+                sensors.extend(cls(coordinator, device, indexed.group) for cls in craft_sensors)
+            elif device.device_type == 1:  # Keg device
+                sensors.extend(cls(coordinator, device, indexed.group) for cls in keg_sensors)
+            added_devices.add(serial_number)
+
+        # Devices that drop out of the response keep their entities, which
+        # pick the device up again from the index once it reconnects
+        if sensors:
+            async_add_entities(sensors)
 
     # Add initial sensors
     add_new_sensors()
-    async_add_entities(sensors)
 
     # Listen for updates from the coordinator and add new sensors dynamically
-    async def handle_coordinator_update():
-        add_new_sensors()
-        async_add_entities(sensors)
-
-    coordinator.async_add_listener(handle_coordinator_update)
-
-class MiniBrewDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching MiniBrew data from the API."""
-
-    def __init__(self, hass, client, config_entry):
-        """Initialize the coordinator."""
-        self.client = client
-        self.config_entry = config_entry
-        refresh_interval = config_entry.options.get("refresh_interval", 60)
-        super().__init__(
-            hass,
-            _LOGGER,
-            name="MiniBrew Data Update Coordinator",
-            update_interval=timedelta(seconds=refresh_interval),  # Fetch data every 30 seconds
-        )
-        self.client = client
-
-    async def _async_update_data(self):
-        """Fetch data from the API."""
-        try:
-            _LOGGER.debug("Fetching data from MiniBrew API...")
-            data = await self.hass.async_add_executor_job(self.client.get_brewery_overview)
-            _LOGGER.debug(f"Fetched data: {data}")
-            return data
-        except Exception as err:
-            _LOGGER.error(f"Error fetching data: {err}")
-            raise UpdateFailed(f"Error fetching data: {err}")
+    config_entry.async_on_unload(coordinator.async_add_listener(add_new_sensors))
 
 class CraftSensor(SensorEntity):
     """Base class for MiniBrew sensors."""
@@ -148,8 +79,8 @@ class CraftSensor(SensorEntity):
 
     @property
     def available(self):
-        """Return if the sensor is available."""
-        return self.coordinator.last_update_success
+        """Return if the sensor's device is in the latest overview."""
+        return self.coordinator.last_update_success and self.device_id in self.coordinator.device_index
 
     async def async_update(self):
         """Update the sensor."""
@@ -160,18 +91,19 @@ class CraftSensor(SensorEntity):
         """Disable polling, updates are handled by the coordinator."""
         return False
 
+    @property
+    def entity_registry_enabled_default(self):
+        """Diagnostic sensors are disabled by default."""
+        return self.entity_category != EntityCategory.DIAGNOSTIC
+
     async def async_added_to_hass(self):
         """Register callbacks."""
         self.async_on_remove(self.coordinator.async_add_listener(self.async_write_ha_state))
 
     def _get_latest_device(self):
-        """Get the latest device data from the coordinator."""
-        devices = getattr(self.coordinator.data, self.device_type, [])
-        for dev in devices:
-            device_dict = _device_to_dict(dev)
-            if device_dict.get("serial_number") == self.device_id:
-                return device_dict
-        return None
+        """Get the latest device data from the coordinator's serial number index."""
+        indexed = self.coordinator.device_index.get(self.device_id)
+        return indexed.attributes if indexed else None
 
 class CraftSensorBrewStageSensor(CraftSensor):
     """Sensor for the current brew stage of the Craft device."""
@@ -391,6 +323,7 @@ class CraftSensorCurrentStageSensor(CraftSensor):
     """Sensor for the current stage of the Craft device."""
 
     _attr_translation_key = "current_stage"
+    _unrecorded_attributes = frozenset({"group_durations", "stage_durations"})
 
     @property
     def name(self):
@@ -400,13 +333,27 @@ class CraftSensorCurrentStageSensor(CraftSensor):
     @property
     def native_value(self):
         """Return a human-readable phase name based on the device's group."""
-        for group_name, devices in self.coordinator.data.__dict__.items():
-            for dev in devices:
-                device_dict = _device_to_dict(dev)
-                if device_dict.get("serial_number") == self.device_id:
-                    return group_name
-
-        return "unknown"
+        indexed = self.coordinator.device_index.get(self.device_id)
+        return indexed.group if indexed else "unknown"
+
+    @property
+    def extra_state_attributes(self):
+        """Return the time spent per group and stage in the current session.
+
+        Durations cover finished runs only, so the attributes stay unchanged
+        between transitions and no state is written on every refresh.
+        """
+        tracker = self.coordinator.stage_trackers.get(self.device_id)
+        if tracker is None:
+            return None
+        group_durations, stage_durations = tracker.settled_durations()
+        return {
+            "session_id": tracker.session_id,
+            "group_since": _timestamp_to_iso(tracker.group_since),
+            "stage_since": _timestamp_to_iso(tracker.stage_since),
+            "group_durations": group_durations,
+            "stage_durations": stage_durations,
+        }
 
     @property
     def icon(self):
@@ -511,8 +458,8 @@ class KegSensor(SensorEntity):
     
     @property
     def available(self):
-        """Return if the sensor is available."""
-        return self.coordinator.last_update_success
+        """Return if the sensor's device is in the latest overview."""
+        return self.coordinator.last_update_success and self.device_id in self.coordinator.device_index
 
     async def async_update(self):
         """Update the sensor."""
@@ -523,18 +470,19 @@ class KegSensor(SensorEntity):
         """Disable polling, updates are handled by the coordinator."""
         return False
 
+    @property
+    def entity_registry_enabled_default(self):
+        """Diagnostic sensors are disabled by default."""
+        return self.entity_category != EntityCategory.DIAGNOSTIC
+
     async def async_added_to_hass(self):
         """Register callbacks."""
         self.async_on_remove(self.coordinator.async_add_listener(self.async_write_ha_state))
 
     def _get_latest_device(self):
-        """Get the latest device data from the coordinator."""
-        devices = getattr(self.coordinator.data, self.device_type, [])
-        for dev in devices:
-            device_dict = _device_to_dict(dev)
-            if device_dict.get("serial_number") == self.device_id:
-                return device_dict
-        return None
+        """Get the latest device data from the coordinator's serial number index."""
+        indexed = self.coordinator.device_index.get(self.device_id)
+        return indexed.attributes if indexed else None
 
 class KegCurrentTemperatureSensor(KegSensor):
     """Sensor for the current temperature of the Keg device."""
@@ -804,4 +752,31 @@ class KegActionRequiredSensor(KegSensor):
     @property
     def unique_id(self):
         """Return the unique ID of the sensor."""
-        return f"{self.device_id}_{self.name}"
\ No newline at end of file
+        return f"{self.device_id}_{self.name}"
+
+
+# (sensor kind, entity class) per device type. The kind is the translation key
+# offered in the options; it is kept out of the class because Home Assistant
+# turns _attr_ class attributes into properties.
+CRAFT_SENSORS = (
+    ("current_temperature", CraftSensorCurrentTemperatureSensor),
+    ("target_temperature", CraftSensorTargetTemperatureSensor),
+    ("cloud_connection", CraftSensorOnlineStatusSensor),
+    ("update_status", CraftSensorIsUpdatingSensor),
+    ("brew_stage", CraftSensorBrewStageSensor),
+    ("time_in_stage", CraftSensorTimeInStageSensor),
+    ("current_stage", CraftSensorCurrentStageSensor),
+    ("needs_cleaning", CraftSensorNeedsCleaningSensor),
+    ("user_action_required", CraftUserActionRequiredSensor),
+)
+
+KEG_SENSORS = (
+    ("temperature", KegCurrentTemperatureSensor),
+    ("target_temperature", KegTargetTemperatureSensor),
+    ("beer_style", KegBeerStyleSensor),
+    ("beer_name", KegBeerNameSensor),
+    ("cloud_connection", KegOnlineStatusSensor),
+    ("update_status", KegIsUpdatingSensor),
+    ("needs_cleaning", KegNeedsCleaningSensor),
+    ("user_action_required", KegActionRequiredSensor),
+)
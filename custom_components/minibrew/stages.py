@@ -0,0 +1,104 @@
+"""Per-device accounting of time spent in each group and brew stage."""
+
+
+class StageTracker:
+    """Track the current group and stage of one device and how long each lasted.
+
+    Durations cover the current brew session only and are reset when the
+    device reports a new session_id. Time between two refreshes is credited
+    to the group and stage seen at the earlier refresh, so the tracker only
+    does constant work per update. Gaps longer than max_gap, such as Home
+    Assistant being stopped, are credited as max_gap.
+    """
+
+    def __init__(
+        self,
+        session_id=None,
+        group=None,
+        stage=None,
+        group_since=None,
+        stage_since=None,
+        last_update=None,
+        group_durations=None,
+        stage_durations=None,
+    ):
+        """Initialize the tracker."""
+        self.session_id = session_id
+        self.group = group
+        self.stage = stage
+        self.group_since = group_since
+        self.stage_since = stage_since
+        self.last_update = last_update
+        self.group_durations = dict(group_durations or {})
+        self.stage_durations = dict(stage_durations or {})
+
+    def update(self, group, stage, session_id, now: float, max_gap: float | None = None) -> bool:
+        """Account for the time since the last update and record the new state.
+
+        Returns True when the session, group or stage changed.
+        """
+        changed = False
+        if self.last_update is not None and session_id == self.session_id:
+            elapsed = max(0.0, now - self.last_update)
+            if max_gap is not None:
+                elapsed = min(elapsed, max_gap)
+            if self.group is not None:
+                self.group_durations[self.group] = self.group_durations.get(self.group, 0.0) + elapsed
+            if self.stage is not None:
+                self.stage_durations[self.stage] = self.stage_durations.get(self.stage, 0.0) + elapsed
+        elif session_id != self.session_id:
+            self.session_id = session_id
+            self.group_durations = {}
+            self.stage_durations = {}
+            self.group = self.stage = None
+            changed = True
+
+        if group != self.group:
+            self.group = group
+            self.group_since = now
+            changed = True
+        if stage != self.stage:
+            self.stage = stage
+            self.stage_since = now
+            changed = True
+        self.last_update = now
+        return changed
+
+    def settled_durations(self) -> tuple[dict, dict]:
+        """Return the group and stage durations without the running group and stage.
+
+        Unlike the raw durations these only change on a transition. The time
+        spent in the running group and stage so far is the time since
+        group_since and stage_since.
+        """
+        settled = []
+        for durations, current, since in (
+            (self.group_durations, self.group, self.group_since),
+            (self.stage_durations, self.stage, self.stage_since),
+        ):
+            values = {}
+            for key, seconds in durations.items():
+                if key == current and since is not None and self.last_update is not None:
+                    seconds -= self.last_update - since
+                if round(seconds) > 0:
+                    values[key] = round(seconds)
+            settled.append(values)
+        return settled[0], settled[1]
+
+    def as_dict(self) -> dict:
+        """Return the tracker state for storage."""
+        return {
+            "session_id": self.session_id,
+            "group": self.group,
+            "stage": self.stage,
+            "group_since": self.group_since,
+            "stage_since": self.stage_since,
+            "last_update": self.last_update,
+            "group_durations": self.group_durations,
+            "stage_durations": self.stage_durations,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "StageTracker":
+        """Restore a tracker from storage."""
+        return cls(**{key: data.get(key) for key in cls().as_dict()})
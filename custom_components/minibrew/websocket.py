@@ -0,0 +1,85 @@
+"""Websocket API for MiniBrew dashboards."""
+import time
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, WS_TEMPERATURE_CURVE
+from .curves import DOWNSAMPLERS, downsample_curve
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant):
+    """Register the MiniBrew websocket commands."""
+    websocket_api.async_register_command(hass, ws_temperature_curve)
+
+
+def _resolve_serial_number(hass: HomeAssistant, msg: dict):
+    """Return the serial number of the device a message refers to."""
+    if "serial_number" in msg:
+        return msg["serial_number"]
+    device = dr.async_get(hass).async_get(msg["device_id"])
+    if device is None:
+        return None
+    return next((identifier for domain, identifier in device.identifiers if domain == DOMAIN), None)
+
+
+def _parse_time(value, default: float):
+    """Parse an optional ISO timestamp into epoch seconds."""
+    if value is None:
+        return default
+    parsed = dt_util.parse_datetime(value)
+    return dt_util.as_timestamp(parsed) if parsed is not None else None
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): WS_TEMPERATURE_CURVE,
+    vol.Exclusive("device_id", "device"): str,
+    vol.Exclusive("serial_number", "device"): str,
+    vol.Optional("start_time"): str,
+    vol.Optional("end_time"): str,
+    vol.Optional("points", default=500): vol.All(vol.Coerce(int), vol.Range(min=3, max=5000)),
+    vol.Optional("method", default="lttb"): vol.In(list(DOWNSAMPLERS)),
+})
+@websocket_api.async_response
+async def ws_temperature_curve(hass: HomeAssistant, connection, msg: dict):
+    """Return the downsampled current and target temperature curve of a device."""
+    if "device_id" not in msg and "serial_number" not in msg:
+        connection.send_error(msg["id"], websocket_api.ERR_INVALID_FORMAT, "device_id or serial_number is required")
+        return
+
+    start = _parse_time(msg.get("start_time"), 0.0)
+    end = _parse_time(msg.get("end_time"), time.time())
+    if start is None or end is None:
+        connection.send_error(msg["id"], websocket_api.ERR_INVALID_FORMAT, "Invalid start_time or end_time")
+        return
+
+    serial_number = _resolve_serial_number(hass, msg)
+    coordinator = next(
+        (
+            coordinator
+            for coordinator in hass.data.get(DOMAIN, {}).values()
+            if serial_number is not None and serial_number in coordinator.curves
+        ),
+        None,
+    )
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "No temperature readings for this device")
+        return
+
+    # Copy on the event loop so the refresh cycle can keep appending while we downsample
+    points = coordinator.curves.points(serial_number)
+    curve = await hass.async_add_executor_job(
+        downsample_curve, points, start, end, msg["points"], msg["method"]
+    )
+    connection.send_result(
+        msg["id"],
+        {
+            "serial_number": serial_number,
+            "since": coordinator.curves.first_timestamp(serial_number),
+            **curve,
+        },
+    )
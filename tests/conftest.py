@@ -0,0 +1,75 @@
+"""Fixtures for MiniBrew tests."""
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.minibrew.const import DOMAIN
+
+CRAFT_SERIAL = "CRAFT0001"
+KEG_SERIAL = "KEG0001"
+
+
+def _device(serial_number: str, device_type: int, **fields) -> dict:
+    return {
+        "uuid": f"uuid-{serial_number}",
+        "serial_number": serial_number,
+        "device_type": device_type,
+        "user_action": 0,
+        "process_type": 0,
+        "title": serial_number.title(),
+        "sub_title": "",
+        "session_id": 1,
+        "image": "",
+        "status_time": 60,
+        "stage": "mashing",
+        "beer_name": None,
+        "recipe_version": None,
+        "beer_style": None,
+        "beer_srm": None,
+        "gravity": "",
+        "target_temp": 65.0,
+        "current_temp": 64.5,
+        "online": True,
+        "updating": False,
+        "needs_acid_cleaning": False,
+        "is_starting": False,
+        "software_version": "1.0",
+        **fields,
+    }
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load custom_components/minibrew in every test."""
+    yield
+
+
+@pytest.fixture
+def overview_payload() -> dict:
+    """Return a brewery overview with one Craft and one Keg."""
+    return {
+        "brew_clean_idle": [],
+        "fermenting": [_device(CRAFT_SERIAL, 0)],
+        "serving": [_device(KEG_SERIAL, 1, beer_name="Pale Ale", beer_style="IPA")],
+        "brew_acid_clean_idle": [],
+    }
+
+
+@pytest.fixture
+def mock_client(overview_payload):
+    """Patch the MiniBrew login to return a client serving overview_payload."""
+    client = MagicMock()
+    client.get_brewery_overview_payload.return_value = overview_payload
+    with patch("custom_components.minibrew.MiniBrewClient.login", return_value=client):
+        yield client
+
+
+@pytest.fixture
+def config_entry() -> MockConfigEntry:
+    """Return a MiniBrew config entry."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title="Minibrew Pro",
+        data={"username": "brewer@example.com", "password": "secret"},
+    )
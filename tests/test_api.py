@@ -0,0 +1,19 @@
+"""Tests for the MiniBrew cloud client."""
+from unittest.mock import patch
+
+from custom_components.minibrew.api import MiniBrewClient
+from custom_components.minibrew.const import CLIENT_REQUEST_TIMEOUT
+
+
+def test_requests_carry_a_timeout():
+    """Login and overview requests sent by pymbrewclient get a socket timeout."""
+    with patch("requests.post") as post, patch("requests.get") as get:
+        post.return_value.json.return_value = {"token": "token", "exp": 3600}
+        get.return_value.json.return_value = {"brew_acid_clean_idle": []}
+
+        client = MiniBrewClient.login("user", "password")
+        assert client.get_brewery_overview_payload() == {"brew_acid_clean_idle": []}
+
+    assert post.call_args.kwargs["timeout"] == CLIENT_REQUEST_TIMEOUT
+    assert get.call_args.kwargs["timeout"] == CLIENT_REQUEST_TIMEOUT
+    assert get.call_args.kwargs["headers"]["Authorization"] == "Bearer token"
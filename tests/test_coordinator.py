@@ -0,0 +1,52 @@
+"""Tests for the MiniBrew data update coordinator."""
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import requests
+
+from custom_components.minibrew.const import DOMAIN
+
+
+def _http_error(status_code: int) -> requests.HTTPError:
+    return requests.HTTPError(response=MagicMock(status_code=status_code))
+
+
+async def test_rejected_credentials_back_off_until_accepted(hass, config_entry, mock_client):
+    """Polling backs off while reauth is pending and resumes once a fetch succeeds."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    mock_client.get_brewery_overview_payload.side_effect = _http_error(401)
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.reauth_pending
+    assert coordinator.update_interval == timedelta(seconds=240)
+    assert hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+
+    mock_client.get_brewery_overview_payload.side_effect = None
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert not coordinator.reauth_pending
+    assert coordinator.update_interval == timedelta(seconds=60)
+    assert not hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+
+
+async def test_forbidden_is_not_a_credentials_failure(hass, config_entry, mock_client):
+    """A 403 fails the refresh without asking for new credentials."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    mock_client.get_brewery_overview_payload.side_effect = _http_error(403)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert not coordinator.last_update_success
+    assert not coordinator.reauth_pending
+    assert not hass.config_entries.flow.async_progress_by_handler(DOMAIN)
@@ -0,0 +1,59 @@
+"""Tests for MiniBrew entry setup."""
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.minibrew.const import CONF_SENSOR_KINDS
+
+
+async def test_setup_creates_sensors(hass, config_entry, mock_client):
+    """Every sensor kind is created for a Craft (9) and a Keg (8)."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert config_entry.state is ConfigEntryState.LOADED
+    entries = er.async_entries_for_config_entry(er.async_get(hass), config_entry.entry_id)
+    assert len([entry for entry in entries if entry.domain == "sensor"]) == 17
+
+
+async def test_setup_limits_sensor_kinds(hass, config_entry, mock_client):
+    """Only the selected sensor kinds are created."""
+    config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_SENSOR_KINDS: ["target_temperature", "brew_stage"]}
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    entries = er.async_entries_for_config_entry(er.async_get(hass), config_entry.entry_id)
+    assert sorted(entry.translation_key for entry in entries) == [
+        "brew_stage",
+        "target_temperature",
+        "target_temperature",
+    ]
+
+
+async def test_deselected_sensor_kinds_are_removed(hass, config_entry, mock_client):
+    """Sensors of a kind that is deselected later are removed from the registry."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    hass.config_entries.async_update_entry(config_entry, options={CONF_SENSOR_KINDS: ["brew_stage"]})
+    await hass.async_block_till_done()
+
+    entries = er.async_entries_for_config_entry(er.async_get(hass), config_entry.entry_id)
+    assert [entry.translation_key for entry in entries] == ["brew_stage"]
+
+
+async def test_unload_saves_stage_trackers(hass, hass_storage, config_entry, mock_client):
+    """Unloading the entry writes the stage trackers without waiting for a delayed save."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    hass_storage.clear()
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+    stored = hass_storage[f"minibrew.{config_entry.entry_id}.stages"]["data"]
+    assert list(stored) == ["CRAFT0001"]
@@ -0,0 +1,22 @@
+"""Tests for the per-device stage tracker."""
+from custom_components.minibrew.stages import StageTracker
+
+
+def test_update_reports_transitions():
+    """Only a new session, group or stage counts as a transition."""
+    tracker = StageTracker()
+    assert tracker.update("fermenting", 1, "session", 0.0)
+    assert not tracker.update("fermenting", 1, "session", 60.0)
+    assert tracker.update("fermenting", 2, "session", 120.0)
+    assert tracker.update("fermenting", 2, "other", 180.0)
+
+
+def test_update_caps_long_gaps():
+    """Downtime longer than max_gap is credited as max_gap."""
+    tracker = StageTracker()
+    tracker.update("fermenting", 1, "session", 0.0, max_gap=180)
+    tracker.update("fermenting", 1, "session", 60.0, max_gap=180)
+    tracker.update("fermenting", 1, "session", 3660.0, max_gap=180)
+
+    assert tracker.group_durations == {"fermenting": 240.0}
+    assert tracker.stage_durations == {1: 240.0}